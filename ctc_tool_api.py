@@ -3,31 +3,94 @@ CTC Budget Checker Tool API
 FastAPI endpoint to check if candidate's expected CTC is within budget
 """
 
-from fastapi import FastAPI, HTTPException
-from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field, validator
-from typing import Optional
+from fastapi import FastAPI, Request
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, Response
+from fastnumbers import try_float
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+from functools import lru_cache
+from typing import Any, Optional
 import logging
+import os
+import orjson
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Swagger UI, ReDoc and the OpenAPI schema are only served outside production (ENV=production)
+DOCS_ENABLED = os.environ.get("ENV") != "production"
+
 # Initialize FastAPI app
 app = FastAPI(
     title="CTC Budget Checker API",
     description="API to check if candidate's expected CTC is within company budget",
-    version="1.0.0"
+    version="1.0.0",
+    docs_url="/docs" if DOCS_ENABLED else None,
+    redoc_url="/redoc" if DOCS_ENABLED else None,
+    openapi_url="/openapi.json" if DOCS_ENABLED else None
 )
 
+
+class SimpleCORSMiddleware:
+    """
+    Minimal ASGI CORS middleware for our static allow-all policy.
+    Mirrors CORSMiddleware(allow_origins=["*"], allow_credentials=True,
+    allow_methods=["*"], allow_headers=["*"]) without the generic machinery.
+    """
+
+    ALLOW_METHODS = b"DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT"
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        origin = headers.get(b"origin")
+        if origin is None:
+            await self.app(scope, receive, send)
+            return
+
+        # Preflight: answer directly with a static 204
+        if scope["method"] == "OPTIONS" and b"access-control-request-method" in headers:
+            preflight_headers = [
+                (b"access-control-allow-origin", origin),
+                (b"access-control-allow-credentials", b"true"),
+                (b"access-control-allow-methods", self.ALLOW_METHODS),
+                (b"access-control-max-age", b"600"),
+                (b"vary", b"Origin"),
+            ]
+            requested_headers = headers.get(b"access-control-request-headers")
+            if requested_headers:
+                preflight_headers.append((b"access-control-allow-headers", requested_headers))
+            await send({"type": "http.response.start", "status": 204, "headers": preflight_headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        # Browsers reject "*" on credentialed requests, so echo the origin when cookies are sent
+        allow_origin = origin if b"cookie" in headers else b"*"
+
+        async def send_with_cors(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", []))
+                message["headers"].append((b"access-control-allow-origin", allow_origin))
+                message["headers"].append((b"access-control-allow-credentials", b"true"))
+                if allow_origin is origin:
+                    message["headers"].append((b"vary", b"Origin"))
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
+
+
 # Enable CORS for Ultravox to call this endpoint
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+app.add_middleware(SimpleCORSMiddleware)
+
+# Compress larger responses (e.g. /openapi.json); tiny /check-ctc payloads stay uncompressed
+app.add_middleware(GZipMiddleware, minimum_size=1000)
 
 
 # Request/Response Models
@@ -36,13 +99,14 @@ class CTCRequest(BaseModel):
     expected_ctc: str = Field(..., description="Candidate's expected CTC in LPA (e.g., '45', '85')")
     max_budget: str = Field(..., description="Maximum budget for position in LPA")
 
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "expected_ctc": "85",
                 "max_budget": "90"
             }
         }
+    )
 
 
 class CTCResponse(BaseModel):
@@ -51,13 +115,49 @@ class CTCResponse(BaseModel):
     message: str = Field(..., description="Detailed message about the result")
     error: Optional[str] = Field(None, description="Error type if result is 'Error'")
 
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "result": "Within budget",
                 "message": "Expected CTC of 85.0 LPA is within the maximum budget of 90.0 LPA"
             }
         }
+    )
+
+
+# Upper bound on pairs per /check-ctc-batch request (each pair is handled in Python)
+BATCH_MAX_PAIRS = 1000
+
+
+class CTCBatchRequest(BaseModel):
+    """Request model for batch CTC budget check (pairs matched by index)"""
+    # Items are read like /check-ctc fields: strings or JSON numbers
+    expected_ctc: list[Any] = Field(
+        ..., max_length=BATCH_MAX_PAIRS, description="Candidates' expected CTCs in LPA"
+    )
+    max_budget: list[Any] = Field(
+        ..., max_length=BATCH_MAX_PAIRS, description="Maximum budgets in LPA, one per expected_ctc"
+    )
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "expected_ctc": ["85", "45"],
+                "max_budget": ["80", "90"]
+            }
+        }
+    )
+
+    @model_validator(mode="after")
+    def check_same_length(self) -> "CTCBatchRequest":
+        if len(self.expected_ctc) != len(self.max_budget):
+            raise ValueError("expected_ctc and max_budget must have the same length")
+        return self
+
+
+class CTCBatchResponse(BaseModel):
+    """Response model for batch CTC budget check"""
+    results: list[CTCResponse] = Field(..., description="One result per input pair, in order")
 
 
 class HealthResponse(BaseModel):
@@ -65,8 +165,130 @@ class HealthResponse(BaseModel):
     status: str = Field(..., description="Service health status")
 
 
-@app.post("/check-ctc", response_model=CTCResponse, summary="Check CTC Budget")
-async def check_ctc(request: CTCRequest) -> CTCResponse:
+# Pre-serialized error payloads (constant, so encoded once at import time)
+MISSING_PARAMS_BODY = orjson.dumps({
+    "result": "Error",
+    "message": "Both expected_ctc and max_budget are required. Proceeding without budget check.",
+    "error": "Missing parameters"
+})
+INVALID_NUMBER_BODY = orjson.dumps({
+    "result": "Error",
+    "message": "expected_ctc and max_budget must be valid numbers. Proceeding without budget check.",
+    "error": "Invalid number format"
+})
+INVALID_RANGE_BODY = orjson.dumps({
+    "result": "Error",
+    "message": "CTC values must be between 0 and 200 LPA. Proceeding without budget check.",
+    "error": "Invalid range"
+})
+
+# Static /health and / payloads, pre-serialized at import time
+HEALTH_BODY = orjson.dumps({"status": "healthy"})
+ROOT_PAYLOAD = {"message": "CTC Budget Checker API"}
+if DOCS_ENABLED:
+    ROOT_PAYLOAD["docs"] = app.docs_url
+ROOT_PAYLOAD["health"] = "/health"
+ROOT_BODY = orjson.dumps(ROOT_PAYLOAD)
+
+# Message templates filled with (expected_ctc, max_budget); %s matches the previous f-string output
+TPL_WITHIN = "Expected CTC of %s LPA is within the maximum budget of %s LPA"
+TPL_ABOVE = "Expected CTC of %s LPA is above the maximum budget of %s LPA"
+
+# Budget outcome keyed by `expected_ctc <= max_budget`: (result, message template)
+BUDGET_OUTCOMES = {
+    True: ("Within budget", TPL_WITHIN),
+    False: ("Above budget", TPL_ABOVE),
+}
+
+
+def _as_str(value: Any) -> str:
+    """Read a request value as a stripped string ('' if missing)"""
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value.strip()
+    return str(value)
+
+
+def _field_str(data: dict, key: str) -> str:
+    """Read a request field as a stripped string ('' if missing)"""
+    return _as_str(data.get(key))
+
+
+def _json_bytes_response(body: bytes) -> Response:
+    """Wrap pre-serialized JSON bytes in a fresh Response (Response objects are stateful)"""
+    return Response(content=body, media_type="application/json")
+
+
+def _server_error_response(endpoint: str, exc: Exception) -> ORJSONResponse:
+    """Log an unexpected error but return 200 with error info for graceful degradation"""
+    logger.error(f"Unexpected error in {endpoint}: {str(exc)}")
+    return ORJSONResponse({
+        "result": "Error",
+        "message": f"An unexpected error occurred: {str(exc)}. Proceeding without budget check.",
+        "error": "Server error"
+    })
+
+
+# Longest CTC value accepted (every valid 0-200 value fits); keeps cache keys small and
+# stops garbage inputs from evicting real (expected_ctc, max_budget) pairs
+MAX_VALUE_CHARS = 32
+
+
+def _ctc_body(expected_ctc_str: str, max_budget_str: str) -> bytes:
+    """Serialized /check-ctc response for stripped inputs, rejecting oversized values before the cache"""
+    if not expected_ctc_str or not max_budget_str:
+        return MISSING_PARAMS_BODY
+    if len(expected_ctc_str) > MAX_VALUE_CHARS or len(max_budget_str) > MAX_VALUE_CHARS:
+        return INVALID_NUMBER_BODY
+    return _compute_ctc_body(expected_ctc_str, max_budget_str)
+
+
+@lru_cache(maxsize=1024)
+def _compute_ctc_body(expected_ctc_str: str, max_budget_str: str) -> bytes:
+    """
+    Compute the serialized /check-ctc response for a pair of stripped inputs.
+    Results are deterministic, so repeated (expected_ctc, max_budget) pairs are served from the cache.
+    """
+    # Validate inputs are not empty
+    if not expected_ctc_str or not max_budget_str:
+        return MISSING_PARAMS_BODY
+
+    # Convert to float for comparison (try_float returns None instead of raising)
+    expected_ctc = try_float(expected_ctc_str, on_fail=None, allow_underscores=True)
+    max_budget = try_float(max_budget_str, on_fail=None, allow_underscores=True)
+    if expected_ctc is None or max_budget is None:
+        return INVALID_NUMBER_BODY
+
+    # Validate reasonable ranges (0-200 LPA)
+    out_of_range = (
+        (expected_ctc < 0.0) | (expected_ctc > 200.0) | (max_budget < 0.0) | (max_budget > 200.0)
+    )
+    if out_of_range:
+        return INVALID_RANGE_BODY
+
+    # Check budget
+    result, template = BUDGET_OUTCOMES[expected_ctc <= max_budget]
+    message = template % (expected_ctc, max_budget)
+
+    return orjson.dumps({"result": result, "message": message, "error": None})
+
+
+# Endpoints stay `async def` so FastAPI runs them directly on the event loop (no threadpool hop)
+@app.post(
+    "/check-ctc",
+    response_class=ORJSONResponse,
+    responses={200: {"model": CTCResponse}},
+    # Body is parsed by hand with orjson; CTCRequest only documents it in OpenAPI
+    openapi_extra={
+        "requestBody": {
+            "content": {"application/json": {"schema": CTCRequest.model_json_schema()}},
+            "required": True
+        }
+    },
+    summary="Check CTC Budget"
+)
+async def check_ctc(request: Request) -> Response:
     """
     Check if candidate's expected CTC is within company budget.
 
@@ -76,88 +298,82 @@ async def check_ctc(request: CTCRequest) -> CTCResponse:
     - **Error**: If validation fails (with graceful degradation message)
     """
     try:
-        expected_ctc_str = request.expected_ctc.strip()
-        max_budget_str = request.max_budget.strip()
-
-        # Validate inputs are not empty
-        if not expected_ctc_str or not max_budget_str:
-            return CTCResponse(
-                result="Error",
-                error="Missing parameters",
-                message="Both expected_ctc and max_budget are required. Proceeding without budget check."
-            )
-
-        # Convert to float for comparison
-        try:
-            expected_ctc = float(expected_ctc_str)
-            max_budget = float(max_budget_str)
-        except ValueError:
-            return CTCResponse(
-                result="Error",
-                error="Invalid number format",
-                message="expected_ctc and max_budget must be valid numbers. Proceeding without budget check."
-            )
-
-        # Validate reasonable ranges (0-200 LPA)
-        if expected_ctc < 0 or expected_ctc > 200 or max_budget < 0 or max_budget > 200:
-            return CTCResponse(
-                result="Error",
-                error="Invalid range",
-                message="CTC values must be between 0 and 200 LPA. Proceeding without budget check."
-            )
-
-        # Check budget
-        if expected_ctc <= max_budget:
-            result = "Within budget"
-            message = f"Expected CTC of {expected_ctc} LPA is within the maximum budget of {max_budget} LPA"
-        else:
-            result = "Above budget"
-            message = f"Expected CTC of {expected_ctc} LPA is above the maximum budget of {max_budget} LPA"
-
-        return CTCResponse(result=result, message=message)
+        data = orjson.loads(await request.body())
+    except orjson.JSONDecodeError:
+        return _json_bytes_response(MISSING_PARAMS_BODY)
+    if not isinstance(data, dict):
+        return _json_bytes_response(MISSING_PARAMS_BODY)
 
+    # Handled in the route (not an app-level handler) so the response still passes through CORS
+    try:
+        body = _ctc_body(_field_str(data, "expected_ctc"), _field_str(data, "max_budget"))
     except Exception as e:
-        # Log the error but return 200 with error info for graceful degradation
-        logger.error(f"Unexpected error in check_ctc: {str(e)}")
-        return CTCResponse(
-            result="Error",
-            error="Server error",
-            message=f"An unexpected error occurred: {str(e)}. Proceeding without budget check."
-        )
+        return _server_error_response("check_ctc", e)
+    return _json_bytes_response(body)
 
 
-@app.get("/health", response_model=HealthResponse, summary="Health Check")
-async def health() -> HealthResponse:
+@app.post(
+    "/check-ctc-batch",
+    response_class=ORJSONResponse,
+    responses={200: {"model": CTCBatchResponse}},
+    summary="Check CTC Budget (batch)"
+)
+async def check_ctc_batch(request: CTCBatchRequest) -> ORJSONResponse:
+    """
+    Check many (expected_ctc, max_budget) pairs in one call.
+
+    Each pair gets the same result as **/check-ctc** would return for it.
+    """
+    # Reuse the /check-ctc pair logic and cache; Fragment embeds the cached JSON bytes as-is
+    results = [
+        orjson.Fragment(_ctc_body(_as_str(e), _as_str(b)))
+        for e, b in zip(request.expected_ctc, request.max_budget)
+    ]
+    return ORJSONResponse({"results": results})
+
+
+@app.get(
+    "/health",
+    response_class=ORJSONResponse,
+    responses={200: {"model": HealthResponse}},
+    summary="Health Check"
+)
+async def health() -> Response:
     """
     Health check endpoint to verify service is running.
     """
-    return HealthResponse(status="healthy")
+    return Response(content=HEALTH_BODY, media_type="application/json", headers={"cache-control": "no-store"})
 
 
-@app.get("/", summary="Root")
-async def root():
+@app.get("/", response_class=ORJSONResponse, summary="Root")
+async def root() -> Response:
     """
-    Root endpoint - redirects to API documentation.
+    Root endpoint - points to the API documentation (when enabled) and health check.
     """
-    return {
-        "message": "CTC Budget Checker API",
-        "docs": "/docs",
-        "health": "/health"
-    }
+    return _json_bytes_response(ROOT_BODY)
 
 
 if __name__ == "__main__":
     import uvicorn
-    import os
 
     # Use PORT from environment (for EasyPanel/Railway/Render) or default to 8000 for local dev
     port = int(os.environ.get("PORT", 8000))
 
-    # Run with uvicorn
+    # Auto-reload only for local dev; the reload supervisor is not wanted when PORT is set by the platform
+    reload = "PORT" not in os.environ
+
+    # One process per CPU in production (override with WEB_CONCURRENCY); reload mode needs a single worker
+    workers = 1 if reload else int(os.environ.get("WEB_CONCURRENCY", os.cpu_count() or 1))
+
+    # Run with uvicorn on uvloop + httptools (installed via uvicorn[standard]);
+    # loop="auto" picks uvloop when available (it is not installed on Windows)
     uvicorn.run(
         "ctc_tool_api:app",
         host="0.0.0.0",
         port=port,
-        reload=True,  # Auto-reload on code changes (dev only)
+        loop="auto",
+        http="httptools",
+        reload=reload,
+        workers=workers,
         log_level="info"
     )